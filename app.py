@@ -5,13 +5,36 @@ A Streamlit application for calculating precious metal weights from STL files
 
 import streamlit as st
 import numpy as np
+import pandas as pd
 from stl import mesh
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import struct
 import tempfile
+import hashlib
 import os
+from collections import namedtuple
 from pathlib import Path
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to NumPy
+    njit = None
+
+try:
+    import open3d as o3d
+except ImportError:  # open3d is optional; decimate by random sampling instead
+    o3d = None
+
+try:
+    import openstl
+except ImportError:  # openstl is optional; ASCII files fall back to numpy-stl
+    openstl = None
+
+try:
+    import xxhash
+except ImportError:  # xxhash is optional; fall back to hashlib
+    xxhash = None
+
 # Page configuration
 st.set_page_config(
     page_title="STL weight generator",
@@ -21,203 +44,269 @@ st.set_page_config(
 )
 
 # Custom CSS for professional styling
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Cormorant+Garamond:wght@300;400;600;700&family=Space+Mono:wght@400;700&display=swap');
-    
-    /* Main container styling */
-    .main {
-        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-    }
-    
-    /* Headers with luxury font */
-    h1, h2, h3 {
-        font-family: 'Cormorant Garamond', serif !important;
-        color: #f0e6d2 !important;
-        font-weight: 600 !important;
-    }
-    
-    h1 {
-        font-size: 3.5rem !important;
-        margin-bottom: 0.5rem !important;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-    }
-    
-    /* Metric cards */
-    [data-testid="stMetricValue"] {
-        font-family: 'Space Mono', monospace !important;
-        font-size: 2rem !important;
-        color: #ffd700 !important;
-    }
-    
-    [data-testid="stMetricLabel"] {
-        font-family: 'Cormorant Garamond', serif !important;
-        color: #c0c0c0 !important;
-        font-size: 1.1rem !important;
-    }
-    
-    /* Sidebar styling */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #0f0f1e 0%, #1a1a2e 100%);
-        border-right: 2px solid #ffd700;
-    }
-    
-    [data-testid="stSidebar"] h1, 
-    [data-testid="stSidebar"] h2,
-    [data-testid="stSidebar"] h3 {
-        color: #ffd700 !important;
-    }
-    
-    /* File uploader */
-    [data-testid="stFileUploader"] {
-        background: rgba(255, 215, 0, 0.05);
-        border: 2px dashed #ffd700;
-        border-radius: 10px;
-        padding: 20px;
-    }
-    
-    /* Buttons */
-    .stButton > button {
-        background: linear-gradient(135deg, #ffd700 0%, #ffed4e 100%);
-        color: #1a1a2e;
-        font-family: 'Space Mono', monospace;
-        font-weight: 700;
-        border: none;
-        border-radius: 8px;
-        padding: 0.75rem 2rem;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 15px rgba(255, 215, 0, 0.3);
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(255, 215, 0, 0.5);
-    }
-    
-    /* Info boxes */
-    .stAlert {
-        background: rgba(255, 215, 0, 0.1);
-        border-left: 4px solid #ffd700;
-        border-radius: 8px;
-    }
-    
-    /* Tabs */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-        background: rgba(255, 215, 0, 0.05);
-        padding: 10px;
-        border-radius: 10px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        font-family: 'Space Mono', monospace;
-        background: transparent;
-        color: #c0c0c0;
-        border-radius: 6px;
-        padding: 10px 20px;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, #ffd700 0%, #ffed4e 100%);
-        color: #1a1a2e;
-        font-weight: 700;
-    }
-    
-    /* Dataframe styling */
-    .stDataFrame {
-        font-family: 'Space Mono', monospace;
-    }
-    
-    /* Expander */
-    .streamlit-expanderHeader {
-        font-family: 'Cormorant Garamond', serif;
-        font-size: 1.3rem;
-        color: #ffd700 !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+@st.cache_resource
+def _css():
+    """Read the stylesheet once per server process."""
+    return f"<style>\n{(Path(__file__).parent / 'style.css').read_text()}</style>"
+
+st.markdown(_css(), unsafe_allow_html=True)
 
 # Material properties
-MATERIAL_DENSITIES = {
-    '14K Gold': 0.0131,
-    '18K Gold': 0.0154,
-    '22K Gold': 0.0174,
-    '24K Gold': 0.0193,
-    'Silver (925)': 0.0104,
-    'Platinum (950)': 0.0214,
-    'Platinum (900)': 0.0204,
-    'Palladium': 0.0120,
-    'White Gold (18K)': 0.0147,
-    'Rose Gold (18K)': 0.0150,
-}
+Material = namedtuple('Material', 'name density color info')
 
-MATERIAL_COLORS = {
-    '14K Gold': '#DAA520',
-    '18K Gold': '#FFD700',
-    '22K Gold': '#FFA500',
-    '24K Gold': '#FFD700',
-    'Silver (925)': '#C0C0C0',
-    'Platinum (950)': '#E5E4E2',
-    'Platinum (900)': '#E5E4E2',
-    'Palladium': '#CED0DD',
-    'White Gold (18K)': '#F5F5F5',
-    'Rose Gold (18K)': '#B76E79',
-}
+MATERIALS = [
+    Material('14K Gold', 0.0131, '#DAA520', '58.3% pure - Common for everyday jewelry'),
+    Material('18K Gold', 0.0154, '#FFD700', '75.0% pure - Premium jewelry standard'),
+    Material('22K Gold', 0.0174, '#FFA500', '91.7% pure - High-end, investment grade'),
+    Material('24K Gold', 0.0193, '#FFD700', '99.9% pure - Pure gold, very soft'),
+    Material('Silver (925)', 0.0104, '#C0C0C0', '92.5% pure - Sterling silver standard'),
+    Material('Platinum (950)', 0.0214, '#E5E4E2', '95.0% pure - Luxury jewelry material'),
+    Material('Platinum (900)', 0.0204, '#E5E4E2', '90.0% pure - Alternative platinum alloy'),
+    Material('Palladium', 0.0120, '#CED0DD', '95.0% pure - Lighter platinum alternative'),
+    Material('White Gold (18K)', 0.0147, '#F5F5F5', '75.0% pure - Gold with white metals'),
+    Material('Rose Gold (18K)', 0.0150, '#B76E79', '75.0% pure - Gold with copper'),
+]
 
-MATERIAL_INFO = {
-    '14K Gold': '58.3% pure - Common for everyday jewelry',
-    '18K Gold': '75.0% pure - Premium jewelry standard',
-    '22K Gold': '91.7% pure - High-end, investment grade',
-    '24K Gold': '99.9% pure - Pure gold, very soft',
-    'Silver (925)': '92.5% pure - Sterling silver standard',
-    'Platinum (950)': '95.0% pure - Luxury jewelry material',
-    'Platinum (900)': '90.0% pure - Alternative platinum alloy',
-    'Palladium': '95.0% pure - Lighter platinum alternative',
-    'White Gold (18K)': '75.0% pure - Gold with white metals',
-    'Rose Gold (18K)': '75.0% pure - Gold with copper',
+_IDX = {m.name: i for i, m in enumerate(MATERIALS)}
+
+# Densities aligned with material names for vectorized weight tables
+_MAT_NAMES = tuple(m.name for m in MATERIALS)
+_DENSITIES = np.fromiter((m.density for m in MATERIALS), dtype=np.float64)
+_DENSITIES_TROY = _DENSITIES / 31.1035
+_DENSITIES_DWT = _DENSITIES / 1.55517
+
+# Static sidebar content, rendered once at import
+_REF_CARDS = {
+    m.name: f"""
+    <div style='background: rgba(255, 215, 0, 0.05); 
+                border-left: 4px solid {m.color}; 
+                padding: 15px; 
+                margin-bottom: 15px;
+                border-radius: 8px;'>
+        <h4 style='margin: 0; color: {m.color};'>{m.name}</h4>
+        <p style='margin: 5px 0; color: #c0c0c0; font-size: 0.9rem;'>{m.info}</p>
+        <p style='margin: 5px 0; color: #ffd700; font-family: "Space Mono"; font-weight: 700;'>
+            {m.density:.4f} g/mm³
+        </p>
+    </div>
+    """
+    for m in (MATERIALS[_IDX[name]] for name in ('18K Gold', 'Silver (925)', 'Platinum (950)'))
 }
 
+_WEIGHT_FORMULA = r"\text{Weight} = \text{Volume} \times \text{Density}"
+_VOLUME_FORMULA = r"V_{total} = \sum_{i=1}^{n} \frac{1}{6} (\mathbf{A}_i \cdot (\mathbf{B}_i \times \mathbf{C}_i))"
+
+# Triangle budget for the 3D viewer; calculations always use the full mesh
+MAX_RENDER_TRIANGLES = 200_000
+
+# 3D viewer styling shared by every render
+_LIGHTING = dict(
+    ambient=0.6,
+    diffuse=0.9,
+    specular=0.8,
+    roughness=0.2,
+    fresnel=0.5
+)
+
+_LIGHTPOS = dict(x=100, y=100, z=100)
+
+_SCENE_AXIS_STYLE = dict(
+    backgroundcolor='rgb(20, 20, 30)',
+    gridcolor='rgba(255, 215, 0, 0.1)',
+    showbackground=True,
+    zerolinecolor='rgba(255, 215, 0, 0.3)'
+)
+_SCENE_XAXIS = dict(_SCENE_AXIS_STYLE, title='X (mm)')
+_SCENE_YAXIS = dict(_SCENE_AXIS_STYLE, title='Y (mm)')
+_SCENE_ZAXIS = dict(_SCENE_AXIS_STYLE, title='Z (mm)')
+
+_CAMERA = dict(
+    eye=dict(x=1.5, y=1.5, z=1.3),
+    center=dict(x=0, y=0, z=0),
+    up=dict(x=0, y=0, z=1)
+)
+
+# Binary STL record: normal, three vertices, attribute byte count
+_STL_RECORD = np.dtype([('normal', '<f4', (3,)), ('vectors', '<f4', (3, 3)), ('attr', '<u2')])
+
 # Core functions
-def calculate_stl_volume(stl_mesh):
-    """Calculate volume using signed tetrahedra method."""
-    volume = 0.0
-    for triangle in stl_mesh.vectors:
-        A, B, C = triangle[0], triangle[1], triangle[2]
-        volume += np.dot(A, np.cross(B, C))
-    return abs(volume) / 6.0
-
-def calculate_weight(volume_mm3, material_name):
-    """Calculate weight from volume and material."""
-    return volume_mm3 * MATERIAL_DENSITIES[material_name]
-
-def get_mesh_statistics(stl_mesh):
-    """Get comprehensive mesh statistics."""
-    all_points = stl_mesh.vectors.reshape(-1, 3)
+def _to_soa(verts):
+    """Transpose (n, 3, 3) triangles to a contiguous float32 (vertex, axis, n) array."""
+    return np.ascontiguousarray(verts.transpose(1, 2, 0), dtype=np.float32)
+
+def _mesh_stats_numpy(soa):
+    """Volume, area, bbox and vertex sum of a (3, 3, n) triangle array."""
+    # Per-triangle math stays in float32 like the STL data; totals accumulate in float64
+    (ax, ay, az), (bx, by, bz), (cx, cy, cz) = soa
+    # One edge cross product N = (B - A) x (C - A) serves both totals:
+    # area is |N| / 2, and A . N == A . (B x C) gives the signed tetra volume
+    ux, uy, uz = bx - ax, by - ay, bz - az
+    wx, wy, wz = cx - ax, cy - ay, cz - az
+    nx = uy * wz - uz * wy
+    ny = uz * wx - ux * wz
+    nz = ux * wy - uy * wx
+    volume = (ax * nx + ay * ny + az * nz).sum(dtype=np.float64)
+    area = 0.5 * np.sqrt(nx * nx + ny * ny + nz * nz).sum(dtype=np.float64)
+    return (float(volume), float(area),
+            soa.min(axis=(0, 2)), soa.max(axis=(0, 2)), soa.sum(axis=(0, 2), dtype=np.float64))
+
+if njit is not None:
+    @njit(fastmath=True, cache=True)
+    def mesh_stats_kernel(soa):
+        """Fused single pass over a (3, 3, n) float32 array; mirrors _mesh_stats_numpy."""
+        # Scalar accumulators are float64; everything per-triangle stays float32
+        n = soa.shape[2]
+        volume = 0.0
+        area = 0.0
+        sx = 0.0
+        sy = 0.0
+        sz = 0.0
+        # Seed the bbox from a real vertex: fastmath assumes no infinities
+        min_x = max_x = soa[0, 0, 0]
+        min_y = max_y = soa[0, 1, 0]
+        min_z = max_z = soa[0, 2, 0]
+        for t in range(n):
+            ax, ay, az = soa[0, 0, t], soa[0, 1, t], soa[0, 2, t]
+            bx, by, bz = soa[1, 0, t], soa[1, 1, t], soa[1, 2, t]
+            cx, cy, cz = soa[2, 0, t], soa[2, 1, t], soa[2, 2, t]
+
+            # Edge cross product N = (B - A) x (C - A)
+            ux, uy, uz = bx - ax, by - ay, bz - az
+            wx, wy, wz = cx - ax, cy - ay, cz - az
+            nx = uy * wz - uz * wy
+            ny = uz * wx - ux * wz
+            nz = ux * wy - uy * wx
+
+            # Signed tetrahedron volume against the origin: A . N == A . (B x C)
+            volume += ax * nx + ay * ny + az * nz
+
+            # Triangle area: |N| / 2
+            area += np.sqrt(nx * nx + ny * ny + nz * nz)
+
+            sx += ax + bx + cx
+            sy += ay + by + cy
+            sz += az + bz + cz
+            min_x = min(min_x, ax, bx, cx)
+            min_y = min(min_y, ay, by, cy)
+            min_z = min(min_z, az, bz, cz)
+            max_x = max(max_x, ax, bx, cx)
+            max_y = max(max_y, ay, by, cy)
+            max_z = max(max_z, az, bz, cz)
+        return (volume, 0.5 * area,
+                np.array((min_x, min_y, min_z)), np.array((max_x, max_y, max_z)),
+                np.array((sx, sy, sz)))
+
+def mesh_stats(soa):
+    """Signed volume, surface area, bbox min/max and vertex sum in one pass."""
+    if njit is not None and soa.shape[2]:
+        return mesh_stats_kernel(soa)
+    return _mesh_stats_numpy(soa)
+
+def _file_hash(data):
+    """Cheap content key for uploaded file bytes."""
+    if xxhash is not None:
+        return xxhash.xxh64(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _load_mesh(file_hash, _uploaded_file):
+    """Parse an uploaded STL into read-only (n, 3, 3) and (3, 3, n) triangle arrays."""
+    parsed = _parse_stl(_uploaded_file)
+    # Both layouts are copied straight from the parsed data: the (n, 3, 3) one
+    # feeds the viewer, the (vertex, axis, n) one gives the statistics
+    # contiguous per-axis streams
+    vectors = np.ascontiguousarray(parsed, dtype=np.float32)
+    soa = _to_soa(parsed)
+    # Shared across reruns and sessions, so nobody may modify them in place
+    vectors.setflags(write=False)
+    soa.setflags(write=False)
+    return vectors, soa
+
+def _parse_stl(uploaded_file):
+    """Decode STL bytes into an (n, 3, 3) float32 array, possibly a strided view."""
+    # Binary STL: 80-byte header, uint32 count, then fixed 50-byte records
+    buf = uploaded_file.getvalue()
+    if len(buf) >= 84:
+        n_tri = struct.unpack_from('<I', buf, 80)[0]
+        if len(buf) == 84 + n_tri * _STL_RECORD.itemsize:
+            records = np.frombuffer(buf, dtype=_STL_RECORD, count=n_tri, offset=84)
+            return records['vectors']
+    
+    # ASCII files: openstl's C++ parser when available (it only reads from a path)
+    if openstl is not None and buf[:5] == b'solid':
+        tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.stl')
+        try:
+            with tmp_file:
+                tmp_file.write(buf)
+            triangles = openstl.read(tmp_file.name)
+        finally:
+            os.unlink(tmp_file.name)
+        return triangles[:, 1:]
+    
+    # Anything else goes through numpy-stl
+    uploaded_file.seek(0)
+    stl_mesh = mesh.Mesh.from_file(uploaded_file.name, calculate_normals=False, fh=uploaded_file)
+    return stl_mesh.vectors
+
+def weights_for(volume_mm3):
+    """Weights of every material in grams, troy ounces and pennyweight."""
+    return volume_mm3 * _DENSITIES, volume_mm3 * _DENSITIES_TROY, volume_mm3 * _DENSITIES_DWT
+
+@st.cache_data(show_spinner=False)
+def get_mesh_statistics(file_hash, _soa):
+    """Get comprehensive mesh statistics, cached per uploaded file."""
+    n_tri = _soa.shape[2]
+    volume, area, min_coords, max_coords, coord_sum = mesh_stats(_soa)
     return {
-        'num_triangles': len(stl_mesh.vectors),
-        'min_coords': all_points.min(axis=0),
-        'max_coords': all_points.max(axis=0),
-        'dimensions': all_points.max(axis=0) - all_points.min(axis=0),
-        'surface_area': stl_mesh.areas.sum(),
-        'center': all_points.mean(axis=0)
+        'num_triangles': n_tri,
+        'volume': abs(volume) / 6.0,
+        'min_coords': min_coords,
+        'max_coords': max_coords,
+        'dimensions': max_coords - min_coords,
+        'surface_area': area,
+        'center': coord_sum / (3 * n_tri)
     }
 
-def create_3d_viewer(stl_mesh, volume, filename="model.stl", selected_material=None):
-    """Create an interactive 3D viewer with weight information."""
-    stats = get_mesh_statistics(stl_mesh)
-    
+def _indexed_mesh(vectors):
+    """Deduplicate shared vertices into (vertices, faces) index form."""
+    flat = np.ascontiguousarray(vectors.reshape(-1, 3))
+    # View each xyz row as one structured scalar for a fast row-wise unique
+    uniq, inverse = np.unique(flat.view([('', flat.dtype)] * 3), return_inverse=True)
+    vertices = uniq.view(flat.dtype).reshape(-1, 3)
+    faces = inverse.reshape(-1, 3).astype(np.int32)
+    return vertices, faces
+
+def _decimate(vectors, target):
+    """Reduce a triangle array to roughly `target` triangles for display."""
+    if o3d is not None:
+        vertices, faces = _indexed_mesh(vectors)
+        tri_mesh = o3d.geometry.TriangleMesh(
+            o3d.utility.Vector3dVector(vertices.astype(np.float64)),
+            o3d.utility.Vector3iVector(faces)
+        )
+        tri_mesh = tri_mesh.simplify_quadric_decimation(target_number_of_triangles=target)
+        return np.asarray(tri_mesh.vertices)[np.asarray(tri_mesh.triangles)].astype(np.float32)
+    idx = np.random.default_rng(0).choice(len(vectors), target, replace=False)
+    return vectors[np.sort(idx)]
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _render_mesh(file_hash, _vectors):
+    """Indexed mesh for display, decimated above MAX_RENDER_TRIANGLES."""
+    vectors = _vectors
+    if len(vectors) > MAX_RENDER_TRIANGLES:
+        vectors = _decimate(vectors, MAX_RENDER_TRIANGLES)
+    return _indexed_mesh(vectors)
+
+def create_3d_viewer(vertices, faces, filename="model.stl", selected_material=None):
+    """Create an interactive 3D viewer for an indexed mesh."""
     # Prepare mesh data
-    vertices = stl_mesh.vectors.reshape(-1, 3)
-    n_tri = len(stl_mesh.vectors)
-    i = np.arange(0, n_tri * 3, 3)
-    j = np.arange(1, n_tri * 3, 3)
-    k = np.arange(2, n_tri * 3, 3)
+    i, j, k = faces[:, 0], faces[:, 1], faces[:, 2]
     
     # Create figure
     fig = go.Figure()
     
     # Determine color based on selected material
-    mesh_color = MATERIAL_COLORS.get(selected_material, '#FFD700') if selected_material else '#FFD700'
+    mesh_color = MATERIALS[_IDX[selected_material]].color if selected_material in _IDX else '#FFD700'
     
     # Add 3D mesh
     fig.add_trace(
@@ -229,14 +318,8 @@ def create_3d_viewer(stl_mesh, volume, filename="model.stl", selected_material=N
             color=mesh_color,
             opacity=0.95,
             flatshading=False,
-            lighting=dict(
-                ambient=0.6,
-                diffuse=0.9,
-                specular=0.8,
-                roughness=0.2,
-                fresnel=0.5
-            ),
-            lightposition=dict(x=100, y=100, z=100),
+            lighting=_LIGHTING,
+            lightposition=_LIGHTPOS,
             hovertemplate='<b>Coordinates</b><br>X: %{x:.2f} mm<br>Y: %{y:.2f} mm<br>Z: %{z:.2f} mm<extra></extra>',
             name='3D Model'
         )
@@ -244,32 +327,10 @@ def create_3d_viewer(stl_mesh, volume, filename="model.stl", selected_material=N
     
     # Update scene
     fig.update_scenes(
-        xaxis=dict(
-            title='X (mm)',
-            backgroundcolor='rgb(20, 20, 30)',
-            gridcolor='rgba(255, 215, 0, 0.1)',
-            showbackground=True,
-            zerolinecolor='rgba(255, 215, 0, 0.3)'
-        ),
-        yaxis=dict(
-            title='Y (mm)',
-            backgroundcolor='rgb(20, 20, 30)',
-            gridcolor='rgba(255, 215, 0, 0.1)',
-            showbackground=True,
-            zerolinecolor='rgba(255, 215, 0, 0.3)'
-        ),
-        zaxis=dict(
-            title='Z (mm)',
-            backgroundcolor='rgb(20, 20, 30)',
-            gridcolor='rgba(255, 215, 0, 0.1)',
-            showbackground=True,
-            zerolinecolor='rgba(255, 215, 0, 0.3)'
-        ),
-        camera=dict(
-            eye=dict(x=1.5, y=1.5, z=1.3),
-            center=dict(x=0, y=0, z=0),
-            up=dict(x=0, y=0, z=1)
-        ),
+        xaxis=_SCENE_XAXIS,
+        yaxis=_SCENE_YAXIS,
+        zaxis=_SCENE_ZAXIS,
+        camera=_CAMERA,
         aspectmode='data',
         bgcolor='rgb(15, 15, 25)'
     )
@@ -290,33 +351,32 @@ def create_3d_viewer(stl_mesh, volume, filename="model.stl", selected_material=N
         font=dict(family='Space Mono', color='#c0c0c0')
     )
     
-    return fig, stats
+    return fig
 
-def create_comparison_chart(volume):
-    """Create a bar chart comparing weights across materials."""
-    materials = list(MATERIAL_DENSITIES.keys())
-    weights = [calculate_weight(volume, m) for m in materials]
-    colors = [MATERIAL_COLORS[m] for m in materials]
-    
+@st.cache_resource(max_entries=8)
+def _cached_viewer_fig(file_hash, filename, material, _vectors):
+    """3D viewer figure, built once per uploaded file and material."""
+    vertices, faces = _render_mesh(file_hash, _vectors)
+    return create_3d_viewer(vertices, faces, filename, material)
+
+@st.cache_resource
+def _base_comparison_fig():
+    """Static layout and styling of the material comparison chart."""
     fig = go.Figure(data=[
         go.Bar(
-            x=materials,
-            y=weights,
+            x=list(_MAT_NAMES),
             marker=dict(
-                color=colors,
+                color=[m.color for m in MATERIALS],
                 line=dict(color='#1a1a2e', width=2)
             ),
-            text=[f"{w:.3f}g" for w in weights],
             textposition='outside',
             textfont=dict(size=12, color='#f0e6d2', family='Space Mono'),
-            hovertemplate='<b>%{x}</b><br>Weight: %{y:.4f}g<br>Troy oz: %{customdata:.4f}<extra></extra>',
-            customdata=[w / 31.1035 for w in weights]
+            hovertemplate='<b>%{x}</b><br>Weight: %{y:.4f}g<br>Troy oz: %{customdata:.4f}<extra></extra>'
         )
     ])
     
     fig.update_layout(
         title={
-            'text': f"<b>Material Weight Comparison</b><br><sub>Volume: {volume:.2f} mm³</sub>",
             'x': 0.5,
             'xanchor': 'center',
             'font': {'size': 18, 'color': '#f0e6d2', 'family': 'Cormorant Garamond'}
@@ -339,6 +399,24 @@ def create_comparison_chart(volume):
     
     return fig
 
+@st.cache_resource(max_entries=8)
+def create_comparison_chart(volume):
+    """Create a bar chart comparing weights across materials."""
+    weights, troy, _ = weights_for(volume)
+    
+    # Copy the shared base figure and fill in only the volume-dependent parts
+    fig = go.Figure(_base_comparison_fig())
+    fig.update_traces(
+        y=weights,
+        text=[f"{w:.3f}g" for w in weights],
+        customdata=troy
+    )
+    fig.update_layout(
+        title_text=f"<b>Material Weight Comparison</b><br><sub>Volume: {volume:.2f} mm³</sub>"
+    )
+    
+    return fig
+
 # Main app
 def main():
     # Header
@@ -358,12 +436,12 @@ def main():
         # Material selection
         selected_material = st.selectbox(
             "Primary Material",
-            options=list(MATERIAL_DENSITIES.keys()),
+            options=_MAT_NAMES,
             index=1,  # Default to 18K Gold
             help="Select the primary material for weight calculation"
         )
         
-        st.info(f"**{selected_material}**\n\n{MATERIAL_INFO[selected_material]}")
+        st.info(f"**{selected_material}**\n\n{MATERIALS[_IDX[selected_material]].info}")
         
         # Unit system
         st.markdown("### 📏 Unit System")
@@ -409,30 +487,29 @@ def main():
         )
         
         if uploaded_file is not None:
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.stl') as tmp_file:
-                tmp_file.write(uploaded_file.read())
-                tmp_path = tmp_file.name
-            
             try:
                 # Load mesh
+                file_hash = _file_hash(uploaded_file.getvalue())
                 with st.spinner('Loading 3D model...'):
-                    stl_mesh = mesh.Mesh.from_file(tmp_path)
+                    vectors, soa = _load_mesh(file_hash, uploaded_file)
                 
                 # Calculate volume
                 with st.spinner('Calculating volume...'):
-                    volume = calculate_stl_volume(stl_mesh)
+                    stats = get_mesh_statistics(file_hash, soa)
+                    volume = stats['volume']
                 
                 # Create viewer
-                fig_3d, stats = create_3d_viewer(
-                    stl_mesh, 
-                    volume, 
+                fig_3d = _cached_viewer_fig(
+                    file_hash,
                     uploaded_file.name,
-                    selected_material
+                    selected_material,
+                    vectors
                 )
                 
                 # Display 3D viewer
                 st.plotly_chart(fig_3d, use_container_width=True)
+                if stats['num_triangles'] > MAX_RENDER_TRIANGLES:
+                    st.caption("(display decimated — calculations use full mesh)")
                 
                 # Model statistics
                 with st.expander("📊 Model Statistics", expanded=True):
@@ -461,36 +538,36 @@ def main():
                 
                 with tab1:
                     # Create detailed weight table
-                    weight_data = []
-                    for material, density in MATERIAL_DENSITIES.items():
-                        weight_g = calculate_weight(volume, material)
-                        troy_oz = weight_g / 31.1035
-                        dwt = weight_g / 1.55517
-                        
-                        weight_data.append({
-                            'Material': material,
-                            'Density (g/mm³)': f"{density:.4f}",
-                            'Weight (g)': f"{weight_g:.4f}",
-                            'Troy oz': f"{troy_oz:.4f}",
-                            'Pennyweight': f"{dwt:.4f}",
-                            'Info': MATERIAL_INFO[material]
-                        })
-                    
-                    import pandas as pd
-                    df = pd.DataFrame(weight_data)
-                    st.dataframe(df, use_container_width=True, hide_index=True)
+                    weights, troy, dwt = weights_for(volume)
+                    df = pd.DataFrame({
+                        'Material': _MAT_NAMES,
+                        'Density (g/mm³)': _DENSITIES,
+                        'Weight (g)': weights,
+                        'Troy oz': troy,
+                        'Pennyweight': dwt,
+                        'Info': [m.info for m in MATERIALS]
+                    })
+                    st.dataframe(
+                        df,
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            col: st.column_config.NumberColumn(format='%.4f')
+                            for col in ('Density (g/mm³)', 'Weight (g)', 'Troy oz', 'Pennyweight')
+                        }
+                    )
                 
                 with tab2:
                     if show_comparison:
-                        fig_comparison = create_comparison_chart(volume)
+                        fig_comparison = create_comparison_chart(round(volume, 6))
                         st.plotly_chart(fig_comparison, use_container_width=True)
                 
                 with tab3:
                     st.markdown("#### Quick Weight Calculator")
                     calc_material = st.selectbox(
                         "Material",
-                        options=list(MATERIAL_DENSITIES.keys()),
-                        index=list(MATERIAL_DENSITIES.keys()).index(selected_material),
+                        options=_MAT_NAMES,
+                        index=_IDX[selected_material],
                         key="calc_material"
                     )
                     
@@ -502,9 +579,10 @@ def main():
                         format="%.2f"
                     )
                     
-                    calc_weight = calculate_weight(calc_volume, calc_material)
-                    calc_troy = calc_weight / 31.1035
-                    calc_dwt = calc_weight / 1.55517
+                    calc_idx = _IDX[calc_material]
+                    calc_weight = calc_volume * _DENSITIES[calc_idx]
+                    calc_troy = calc_volume * _DENSITIES_TROY[calc_idx]
+                    calc_dwt = calc_volume * _DENSITIES_DWT[calc_idx]
                     
                     result_col1, result_col2, result_col3 = st.columns(3)
                     with result_col1:
@@ -514,12 +592,8 @@ def main():
                     with result_col3:
                         st.metric("Pennyweight", f"{calc_dwt:.4f}")
                 
-                # Cleanup
-                os.unlink(tmp_path)
-                
             except Exception as e:
                 st.error(f"Error processing STL file: {str(e)}")
-                os.unlink(tmp_path)
         
         else:
             # Show sample information
@@ -555,21 +629,9 @@ def main():
         # Material reference card
         st.markdown("### 💎 Material Reference")
         
-        for material in ['18K Gold', 'Silver (925)', 'Platinum (950)']:
+        for card in _REF_CARDS.values():
             with st.container():
-                st.markdown(f"""
-                <div style='background: rgba(255, 215, 0, 0.05); 
-                            border-left: 4px solid {MATERIAL_COLORS[material]}; 
-                            padding: 15px; 
-                            margin-bottom: 15px;
-                            border-radius: 8px;'>
-                    <h4 style='margin: 0; color: {MATERIAL_COLORS[material]};'>{material}</h4>
-                    <p style='margin: 5px 0; color: #c0c0c0; font-size: 0.9rem;'>{MATERIAL_INFO[material]}</p>
-                    <p style='margin: 5px 0; color: #ffd700; font-family: "Space Mono"; font-weight: 700;'>
-                        {MATERIAL_DENSITIES[material]:.4f} g/mm³
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(card, unsafe_allow_html=True)
         
         # Quick reference
         st.markdown("### 📏 Unit Conversions")
@@ -582,8 +644,8 @@ def main():
         
         # Formula reference
         st.markdown("### 🧮 Calculation Method")
-        st.latex(r"\text{Weight} = \text{Volume} \times \text{Density}")
-        st.latex(r"V_{total} = \sum_{i=1}^{n} \frac{1}{6} (\mathbf{A}_i \cdot (\mathbf{B}_i \times \mathbf{C}_i))")
+        st.latex(_WEIGHT_FORMULA)
+        st.latex(_VOLUME_FORMULA)
         
         st.markdown("""
         <p style='font-size: 0.85rem; color: #c0c0c0; font-style: italic;'>